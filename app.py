@@ -1,13 +1,10 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import os
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
 import base64
 import uuid
-import pycountry
-from io import BytesIO
 
 # ---------------------------------------------------
 # PAGE CONFIG
@@ -19,16 +16,45 @@ st.set_page_config(page_title="Product Forecast Form", layout="centered")
 # ---------------------------------------------------
 NEPHRO_RED = "#A6192E"
 
-MONTH_LIST = [
+MONTH_LIST = (
     "January", "February", "March", "April", "May", "June",
-    "July", "August", "September", "October", "November", "December"
-]
+    "July", "August", "September", "October", "November", "December",
+)
+
+# Column order of the Google Sheets submission tab
+SHEET_HEADERS = (
+    "Timestamp",
+    "User ID",
+    "Email",
+    "Country",
+    "Company",
+    "Product Group",
+    "Product Name",
+    "Product Code",
+    "Description",
+    *MONTH_LIST,
+    "Total",
+)
+
+# Column order shown on the review page and in the Excel export
+DISPLAY_COLS = ("group", "name", "detail", *MONTH_LIST, "total")
+
+# Template for a fresh forecast row; copied instead of rebuilt per click
+EMPTY_ENTRY = {
+    "group": None,
+    "name": None,
+    "detail": None,
+    "code": None,
+    **dict.fromkeys(MONTH_LIST, 0),
+    "total": 0,
+}
 
 # ---------------------------------------------------
 # FONT + BASIC STYLING (NO FORCED BACKGROUND)
 # ---------------------------------------------------
-st.markdown(
-    f"""
+# Built once at import; the markdown call itself must run every rerun or
+# Streamlit drops the styles from the page.
+PAGE_CSS = f"""
 <style>
 @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;600&display=swap');
 
@@ -59,9 +85,9 @@ button, .stButton > button {{
     margin-bottom: 20px;
 }}
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 # ---------------------------------------------------
 # GOOGLE SHEETS SETUP
@@ -73,114 +99,197 @@ SCOPES = [
 ]
 SERVICE_ACCOUNT_FILE = "service_account.json"
 
-creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-client = gspread.authorize(creds)
-sheet = client.open(SHEET_NAME).sheet1
+
+@st.cache_resource
+def get_sheet():
+    """Authorize once per process; reruns reuse the live client."""
+    # Deferred imports: only the submit path pays the gspread/google-auth
+    # import cost, and only on the first call
+    import gspread
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+    from requests.adapters import HTTPAdapter
+
+    creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+    # Pooled session so repeat submits reuse the TLS connection instead
+    # of paying a new handshake each time
+    session = AuthorizedSession(creds)
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    client = gspread.Client(auth=creds, session=session)
+    return client.open(SHEET_NAME).sheet1
+
+
+@st.cache_resource
+def ensure_header():
+    """Write the Sheets header row if missing; the probe runs once per process."""
+    sheet = get_sheet()
+    if not sheet.row_values(1):
+        sheet.append_row(list(SHEET_HEADERS))
+    return True
 
 # ---------------------------------------------------
 # LOAD LOGO
 # ---------------------------------------------------
+@st.cache_resource
 def load_logo(path: str = "logo.png") -> str:
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode()
 
 
-logo_base64 = load_logo()
+@st.cache_data(show_spinner=False)
+def header_html() -> str:
+    """Header markup interpolated with the base64 logo exactly once."""
+    return f"""
+        <div class="nephro-header">
+            <img src="data:image/png;base64,{load_logo()}" width="200" style="margin-bottom:5px;">
+            <p style="font-size:22px; font-weight:500; margin-top:5px;">
+                Nephrocan Forecast Portal
+            </p>
+        </div>
+        """
 
 # ---------------------------------------------------
 # LOAD PRODUCT LIST
 # ---------------------------------------------------
-@st.cache_data
+@st.cache_resource
 def load_product_data():
-    return pd.read_csv("product list.csv")
+    # cache_resource shares one frame across sessions with no per-session
+    # copy (cache_data would deep-copy on every hit). Callers must treat
+    # the returned frame as read-only.
+    # Prefer the Parquet copy (see csv_to_parquet.py): columnar, binary,
+    # and much faster to parse on cold start than CSV text
+    if os.path.exists("product_list.parquet"):
+        catalog = pd.read_parquet(
+            "product_list.parquet",
+            columns=["Product Group", "Product Name", "Description", "PRODUCT CODE"],
+        )
+    else:
+        catalog = pd.read_csv(
+            "product list.csv",
+            usecols=["Product Group", "Product Name", "Description", "PRODUCT CODE"],
+            dtype={"Product Group": "category"},
+        )
+    catalog = catalog.dropna(subset=["Product Group"]).reset_index(drop=True)
+    catalog["Product Group"] = catalog["Product Group"].astype("category")
+    return catalog
 
 
 df = load_product_data()
-df = df.dropna(subset=["Product Group"])  # ensure no NaN groups
-PRODUCT_GROUPS = sorted(df["Product Group"].unique().tolist())
 
-# ---------------------------------------------------
-# SESSION STATE INITIALIZATION
-# ---------------------------------------------------
-ss = st.session_state
 
-if "page" not in ss:
-    ss.page = "form"  # "form" or "review"
+@st.cache_data(show_spinner=False)
+def country_names():
+    import pycountry  # deferred: pycountry's data tables are slow to load
+
+    return tuple(sorted(c.name for c in pycountry.countries)) + ("Other",)
+
 
-if "product_entries" not in ss:
-    ss.product_entries = []  # list of dict rows
+@st.cache_data(show_spinner=False)
+def country_positions():
+    return {name: i for i, name in enumerate(country_names())}
 
-if "email" not in ss:
-    ss.email = ""
 
-if "company" not in ss:
-    ss.company = ""
+@st.cache_data(show_spinner=False)
+def get_product_groups():
+    return sorted(df["Product Group"].unique().tolist())
 
-if "country" not in ss:
-    ss.country = ""
 
+@st.cache_data(show_spinner=False)
+def group_positions():
+    return {g: i for i, g in enumerate(get_product_groups())}
+
+
+@st.cache_data(show_spinner=False)
+def get_group_lookups():
+    """Per-group option lists and O(1) hash maps, built in one groupby pass."""
+    lookups = {}
+    for g, sub in df.groupby("Product Group", observed=True):
+        # First-wins for duplicate names (some BLOODLINE names have several
+        # code variants): match the old filtered.iloc[0] default
+        first = sub.drop_duplicates("Product Name")
+        by_name = dict(
+            zip(first["Product Name"], zip(first["Description"], first["PRODUCT CODE"]))
+        )
+        by_detail = dict(
+            zip(sub["Description"], zip(sub["Product Name"], sub["PRODUCT CODE"]))
+        )
+        # Tuples: immutable, so the cached options objects stay identity-stable
+        # across reruns and can never be mutated by a caller.
+        names = tuple(sub["Product Name"].drop_duplicates())
+        details = tuple(sub["Description"].drop_duplicates())
+        lookups[g] = {
+            "names": names,
+            "details": details,
+            "name_pos": {n: i for i, n in enumerate(names)},
+            "detail_pos": {d: i for i, d in enumerate(details)},
+            "by_name": by_name,
+            "by_detail": by_detail,
+        }
+    return lookups
+
+
+PRODUCT_GROUPS = get_product_groups()
+
+# ---------------------------------------------------
+# SESSION STATE INITIALIZATION
+# ---------------------------------------------------
+ss = st.session_state
+
+_SESSION_DEFAULTS = {
+    "page": "form",  # "form" or "review"
+    "product_entries": [],  # list of dict rows
+    "email": "",
+    "company": "",
+    "country": "",
+    # Number of rows that are "locked" after first review
+    # (0 means nothing locked yet)
+    "lock_rows": 0,
+}
+
+for _key, _default in _SESSION_DEFAULTS.items():
+    ss.setdefault(_key, _default)
+
+# Kept out of the defaults dict so a uuid isn't generated per rerun
 if "user_id" not in ss:
     ss.user_id = str(uuid.uuid4())[:8]
 
-# Number of rows that are "locked" after first review
-# (0 means nothing locked yet)
-if "lock_rows" not in ss:
-    ss.lock_rows = 0
-
 # ---------------------------------------------------
 # HEADER
 # ---------------------------------------------------
 def render_header():
-    st.markdown(
-        f"""
-        <div class="nephro-header">
-            <img src="data:image/png;base64,{logo_base64}" width="200" style="margin-bottom:5px;">
-            <p style="font-size:22px; font-weight:500; margin-top:5px;">
-                Nephrocan Forecast Portal
-            </p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(header_html(), unsafe_allow_html=True)
 
 
 # ---------------------------------------------------
-# CALLBACKS FOR SYNCING NAME <-> DETAIL
+# NAME <-> DETAIL SYNC (runs on the form-submit rerun)
 # ---------------------------------------------------
-def on_change_group(row_index: int):
-    """When group changes, pick first product in that group."""
-    group = ss.get(f"group_{row_index}")
-    filtered = df[df["Product Group"] == group]
-    if filtered.empty:
+def sync_row_state(rid: str, entry: dict):
+    """Reconcile group/name/detail/code state for one row.
+
+    Widgets inside st.form cannot have on_change callbacks, so the sync
+    happens on the rerun after a submit, before the row's widgets are
+    instantiated. Whichever field differs from the stored entry is the
+    one the user changed and wins. Keys are bound to the row's stable id
+    so widget state survives row reordering.
+    """
+    group = ss.get(f"group_{rid}")
+    lookups = get_group_lookups().get(group)
+    if lookups is None:
         return
-    first = filtered.iloc[0]
-    ss[f"name_{row_index}"] = first["Product Name"]
-    ss[f"detail_{row_index}"] = first["Description"]
-    ss[f"code_{row_index}"] = first["PRODUCT CODE"]
-
-
-def on_change_name(row_index: int):
-    """When name changes, update detail + code."""
-    group = ss.get(f"group_{row_index}")
-    name = ss.get(f"name_{row_index}")
-    filtered = df[(df["Product Group"] == group) & (df["Product Name"] == name)]
-    if filtered.empty:
-        return
-    row = filtered.iloc[0]
-    ss[f"detail_{row_index}"] = row["Description"]
-    ss[f"code_{row_index}"] = row["PRODUCT CODE"]
-
 
-def on_change_detail(row_index: int):
-    """When detail changes, update name + code."""
-    group = ss.get(f"group_{row_index}")
-    detail = ss.get(f"detail_{row_index}")
-    filtered = df[(df["Product Group"] == group) & (df["Description"] == detail)]
-    if filtered.empty:
-        return
-    row = filtered.iloc[0]
-    ss[f"name_{row_index}"] = row["Product Name"]
-    ss[f"code_{row_index}"] = row["PRODUCT CODE"]
+    if group != entry.get("group") and lookups["names"]:
+        # Group changed: jump to the first product in that group
+        first = lookups["names"][0]
+        ss[f"name_{rid}"] = first
+        ss[f"detail_{rid}"], ss[f"code_{rid}"] = lookups["by_name"][first]
+    elif ss.get(f"name_{rid}") != entry.get("name"):
+        match = lookups["by_name"].get(ss.get(f"name_{rid}"))
+        if match is not None:
+            ss[f"detail_{rid}"], ss[f"code_{rid}"] = match
+    elif ss.get(f"detail_{rid}") != entry.get("detail"):
+        match = lookups["by_detail"].get(ss.get(f"detail_{rid}"))
+        if match is not None:
+            ss[f"name_{rid}"], ss[f"code_{rid}"] = match
 
 
 # ---------------------------------------------------
@@ -194,10 +303,8 @@ def render_form_page():
     # ----------------------
     # COUNTRY
     # ----------------------
-    countries = sorted([c.name for c in pycountry.countries]) + ["Other"]
-    default_country_index = (
-        countries.index(ss.country) if ss.country in countries else 0
-    )
+    countries = country_names()
+    default_country_index = country_positions().get(ss.country, 0)
     country_choice = st.selectbox(
         "Select Country",
         countries,
@@ -213,173 +320,185 @@ def render_form_page():
         ss.country = country_choice
 
     # ----------------------
-    # USER INFO
-    # ----------------------
-    st.markdown("### User Information")
-    ss.email = st.text_input("Enter Your Email Address", value=ss.email)
-    ss.company = st.text_input("Company Name", value=ss.company)
-
-    st.markdown("---")
-    st.subheader("Product Forecast")
-
-    # ----------------------
-    # ADD ROW
+    # FORM (batches all widget edits into one rerun per submit)
     # ----------------------
-    if st.button("Add Product Forecast Row"):
-        # New empty row – fully editable
-        ss.product_entries.append(
-            {
-                "group": PRODUCT_GROUPS[0],
-                "name": None,
-                "detail": None,
-                "code": None,
-                **{m: 0 for m in MONTH_LIST},
-                "total": 0,
-            }
-        )
+    with st.form("forecast_form"):
+        # ----- USER INFO -----
+        st.markdown("### User Information")
+        ss.email = st.text_input("Enter Your Email Address", value=ss.email)
+        ss.company = st.text_input("Company Name", value=ss.company)
+
+        st.markdown("---")
+        st.subheader("Product Forecast")
+
+        # ----- LOCKED ROWS SUMMARY -----
+        # One compact table instead of three markdown writes per locked row
+        if ss.lock_rows:
+            locked_meta = pd.DataFrame(ss.product_entries[: ss.lock_rows])
+            st.dataframe(
+                locked_meta[["group", "name", "detail"]],
+                use_container_width=True,
+            )
 
-    # ----------------------
-    # RENDER ROWS
-    # ----------------------
-    for i, entry in enumerate(ss.product_entries):
-        st.markdown(f"#### Product {i+1}")
-
-        is_locked = i < ss.lock_rows  # existing row after review
-
-        # ----- META (GROUP / NAME / DETAIL) -----
-        if is_locked:
-            # Locked – no widgets, only text display
-            st.write(f"**Product Group {i+1}:** {entry['group']}")
-            st.write(f"**Product Name {i+1}:** {entry['name']}")
-            st.write(f"**Product Detail {i+1}:** {entry['detail']}")
-            group = entry["group"]
-            name = entry["name"]
-            detail = entry["detail"]
-            code = entry["code"]
-        else:
-            # Editable row
-            col1, col2 = st.columns(2)
-
-            # --- Initialize session_state keys ONCE (before widgets) ---
-            # Group
-            if f"group_{i}" not in ss:
-                ss[f"group_{i}"] = entry.get("group") or PRODUCT_GROUPS[0]
-            group_value = ss[f"group_{i}"]
-
-            # Names + details for this group
-            filtered = df[df["Product Group"] == group_value]
-            if filtered.empty:
-                # Should not happen, but guard
-                names_for_group = []
-                details_for_group = []
+        # ----- RENDER ROWS -----
+        for i, entry in enumerate(ss.product_entries):
+            st.markdown(f"#### Product {i+1}")
+
+            # Widget keys are bound to the row's stable id, not its list
+            # position, so state survives future insert/delete/reorder
+            rid = entry.setdefault("rid", uuid.uuid4().hex[:8])
+
+            is_locked = i < ss.lock_rows  # existing row after review
+
+            # ----- META (GROUP / NAME / DETAIL) -----
+            if is_locked:
+                # Locked – metadata lives in the summary table above;
+                # only the months below stay editable
+                st.caption(f"{entry['group']} — {entry['name']}")
+                group = entry["group"]
+                name = entry["name"]
+                detail = entry["detail"]
+                code = entry["code"]
             else:
-                names_for_group = filtered["Product Name"].unique().tolist()
-                details_for_group = filtered["Description"].unique().tolist()
-
-            # Name
-            if f"name_{i}" not in ss:
-                if entry.get("name") and entry["name"] in names_for_group:
-                    ss[f"name_{i}"] = entry["name"]
-                elif names_for_group:
-                    ss[f"name_{i}"] = names_for_group[0]
-
-            # Detail
-            if f"detail_{i}" not in ss:
-                if entry.get("detail") and entry["detail"] in details_for_group:
-                    ss[f"detail_{i}"] = entry["detail"]
-                elif details_for_group:
-                    ss[f"detail_{i}"] = details_for_group[0]
-
-            # Code
-            if f"code_{i}" not in ss:
-                # try to find matching row for name+group
-                row_match = df[
-                    (df["Product Group"] == ss[f"group_{i}"])
-                    & (df["Product Name"] == ss[f"name_{i}"])
-                ]
-                if not row_match.empty:
-                    ss[f"code_{i}"] = row_match.iloc[0]["PRODUCT CODE"]
+                # Editable row
+                col1, col2 = st.columns(2)
+
+                # --- Initialize session_state keys ONCE (before widgets) ---
+                # Group
+                if f"group_{rid}" not in ss:
+                    ss[f"group_{rid}"] = entry.get("group") or PRODUCT_GROUPS[0]
+
+                # Reconcile group/name/detail/code after the last submit
+                sync_row_state(rid, entry)
+
+                group_value = ss[f"group_{rid}"]
+
+                # Names + details for this group (precomputed, cached)
+                lookups = get_group_lookups().get(group_value)
+                if lookups is None:
+                    # Should not happen, but guard
+                    names_for_group = []
+                    details_for_group = []
+                    name_pos = {}
+                    detail_pos = {}
                 else:
-                    ss[f"code_{i}"] = entry.get("code")
-
-            # --- Widgets ---
-            group = col1.selectbox(
-                f"Product Group {i+1}",
-                PRODUCT_GROUPS,
-                index=PRODUCT_GROUPS.index(ss[f"group_{i}"]),
-                key=f"group_{i}",
-                on_change=on_change_group,
-                args=(i,),
-            )
+                    names_for_group = lookups["names"]
+                    details_for_group = lookups["details"]
+                    name_pos = lookups["name_pos"]
+                    detail_pos = lookups["detail_pos"]
+
+                # Name
+                if f"name_{rid}" not in ss:
+                    if entry.get("name") and entry["name"] in names_for_group:
+                        ss[f"name_{rid}"] = entry["name"]
+                    elif names_for_group:
+                        ss[f"name_{rid}"] = names_for_group[0]
+
+                # Detail
+                if f"detail_{rid}" not in ss:
+                    if entry.get("detail") and entry["detail"] in details_for_group:
+                        ss[f"detail_{rid}"] = entry["detail"]
+                    elif details_for_group:
+                        ss[f"detail_{rid}"] = details_for_group[0]
+
+                # Code
+                if f"code_{rid}" not in ss:
+                    # try to find matching row for name+group
+                    match = (
+                        get_group_lookups()
+                        .get(group_value, {})
+                        .get("by_name", {})
+                        .get(ss.get(f"name_{rid}"))
+                    )
+                    if match is not None:
+                        ss[f"code_{rid}"] = match[1]
+                    else:
+                        ss[f"code_{rid}"] = entry.get("code")
+
+                # Ensure selected name/detail are valid for this group
+                if ss[f"name_{rid}"] not in names_for_group and names_for_group:
+                    ss[f"name_{rid}"] = names_for_group[0]
+                if ss[f"detail_{rid}"] not in details_for_group and details_for_group:
+                    ss[f"detail_{rid}"] = details_for_group[0]
+
+                # --- Widgets (no callbacks: edits are batched by the form) ---
+                group = col1.selectbox(
+                    f"Product Group {i+1}",
+                    PRODUCT_GROUPS,
+                    index=group_positions().get(ss[f"group_{rid}"], 0),
+                    key=f"group_{rid}",
+                )
 
-            # Recompute filtered after potential group change
-            filtered = df[df["Product Group"] == group]
-            names_for_group = filtered["Product Name"].unique().tolist()
-            details_for_group = filtered["Description"].unique().tolist()
-
-            # Ensure selected name/detail are valid for this group
-            if ss[f"name_{i}"] not in names_for_group and names_for_group:
-                ss[f"name_{i}"] = names_for_group[0]
-            if ss[f"detail_{i}"] not in details_for_group and details_for_group:
-                ss[f"detail_{i}"] = details_for_group[0]
-
-            name = col2.selectbox(
-                f"Product Name {i+1}",
-                names_for_group,
-                index=names_for_group.index(ss[f"name_{i}"]),
-                key=f"name_{i}",
-                on_change=on_change_name,
-                args=(i,),
-            )
+                name = col2.selectbox(
+                    f"Product Name {i+1}",
+                    names_for_group,
+                    index=name_pos.get(ss[f"name_{rid}"], 0),
+                    key=f"name_{rid}",
+                )
 
-            detail = st.selectbox(
-                f"Product Detail {i+1}",
-                details_for_group,
-                index=details_for_group.index(ss[f"detail_{i}"]),
-                key=f"detail_{i}",
-                on_change=on_change_detail,
-                args=(i,),
+                detail = st.selectbox(
+                    f"Product Detail {i+1}",
+                    details_for_group,
+                    index=detail_pos.get(ss[f"detail_{rid}"], 0),
+                    key=f"detail_{rid}",
+                )
+
+                code = ss.get(f"code_{rid}")
+
+            # ----- MONTH INPUTS (ALWAYS EDITABLE) -----
+            # One editable grid per row instead of 12 separate number_inputs
+            month_df = pd.DataFrame(
+                [{m: int(entry.get(m, 0) or 0) for m in MONTH_LIST}]
+            )
+            edited = st.data_editor(
+                month_df,
+                num_rows="fixed",
+                hide_index=True,
+                use_container_width=True,
+                key=f"months_{rid}",
+                column_config={
+                    # required=True keeps cleared cells from committing NaN;
+                    # step=1 rejects decimals instead of truncating them
+                    m: st.column_config.NumberColumn(
+                        m, min_value=0, step=1, required=True, default=0
+                    )
+                    for m in MONTH_LIST
+                },
             )
+            # Belt and braces: never let an empty cell reach int()
+            edited = edited.fillna(0)
+            month_values = {m: int(v) for m, v in edited.iloc[0].items()}
+            total = int(edited.iloc[0].sum())
 
-            code = ss.get(f"code_{i}")
-
-        # ----- MONTH INPUTS (ALWAYS EDITABLE) -----
-        cols = st.columns(3)
-        total = 0
-        month_values = {}
-
-        for idx, m in enumerate(MONTH_LIST):
-            key = f"{m}_{i}"
-            if key not in ss:
-                ss[key] = entry.get(m, 0) or 0
-            with cols[idx % 3]:
-                qty = st.number_input(
-                    f"{m} ({i+1})",
-                    min_value=0,
-                    value=ss[key],
-                    key=key,
-                )
-                month_values[m] = qty
-                total += qty
-
-        st.write(f"**Total: {total}**")
-
-        # ----- UPDATE product_entries WITH CURRENT STATE -----
-        ss.product_entries[i] = {
-            "group": group,
-            "name": name,
-            "detail": detail,
-            "code": code,
-            **month_values,
-            "total": total,
-        }
+            st.write(f"**Total: {total}**")
 
-    st.markdown("---")
+            # ----- UPDATE product_entries WITH CURRENT STATE (in place) -----
+            entry["group"] = group
+            entry["name"] = name
+            entry["detail"] = detail
+            entry["code"] = code
+            entry.update(month_values)
+            entry["total"] = total
 
+        st.markdown("---")
+
+        submitted = st.form_submit_button("Review Forecast")
+
+    # ----------------------
+    # ADD ROW (outside the form: needs an immediate rerun)
     # ----------------------
-    # REVIEW BUTTON
+    if st.button("Add Product Forecast Row"):
+        # New empty row – fully editable
+        new_entry = EMPTY_ENTRY.copy()
+        new_entry["rid"] = uuid.uuid4().hex[:8]
+        new_entry["group"] = PRODUCT_GROUPS[0]
+        ss.product_entries.append(new_entry)
+        st.rerun()
+
     # ----------------------
-    if st.button("Review Forecast"):
+    # REVIEW (on form submit)
+    # ----------------------
+    if submitted:
         if not ss.email.strip():
             st.error("Please enter your email before reviewing.")
         elif not ss.company.strip():
@@ -391,11 +510,31 @@ def render_form_page():
             if ss.lock_rows == 0:
                 ss.lock_rows = len(ss.product_entries)
             ss.page = "review"
+            st.rerun()
 
 
 # ---------------------------------------------------
 # REVIEW PAGE
 # ---------------------------------------------------
+@st.cache_data(max_entries=64)
+def build_xlsx(records: tuple, columns: tuple) -> bytes:
+    """Serialize the forecast once per unique content; reruns reuse the bytes."""
+    from io import BytesIO
+
+    frame = pd.DataFrame(list(records), columns=list(columns))
+    # Explicit integer dtypes so the writer skips per-cell type inference
+    frame[list(MONTH_LIST)] = frame[list(MONTH_LIST)].astype("int64")
+    frame["total"] = frame["total"].astype("int64")
+    buffer = BytesIO()
+    with pd.ExcelWriter(
+        buffer,
+        engine="xlsxwriter",
+        engine_kwargs={"options": {"constant_memory": True}},
+    ) as writer:
+        frame.to_excel(writer, index=False, sheet_name="Forecast")
+    return buffer.getvalue()
+
+
 def render_review_page():
     st.markdown("## Review Your Forecast")
     st.write(f"**Country:** {ss.country}")
@@ -404,20 +543,25 @@ def render_review_page():
 
     df_review = pd.DataFrame(ss.product_entries)
 
+    # One C-level reduction over the month block instead of per-row sums
+    df_review["total"] = (
+        df_review[list(MONTH_LIST)].to_numpy(dtype=np.int64).sum(axis=1)
+    )
+
     # Reorder columns for readability
-    col_order = ["group", "name", "detail"] + MONTH_LIST + ["total"]
-    df_review = df_review[col_order]
+    df_review = df_review[list(DISPLAY_COLS)]
 
     st.dataframe(df_review, use_container_width=True)
 
-    # --- EXPORT TO EXCEL ---
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        df_review.to_excel(writer, index=False)
+    # --- EXPORT TO EXCEL (rebuilt only when the forecast changes) ---
+    xlsx_bytes = build_xlsx(
+        tuple(df_review.itertuples(index=False, name=None)),
+        tuple(df_review.columns),
+    )
 
     st.download_button(
         "Download as Excel",
-        data=buffer.getvalue(),
+        data=xlsx_bytes,
         file_name="forecast_review.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -439,47 +583,51 @@ def render_review_page():
 # ---------------------------------------------------
 # SUBMIT TO GOOGLE SHEETS
 # ---------------------------------------------------
-def submit_to_google():
-    df_submit = pd.DataFrame(ss.product_entries)
-    df_submit["User ID"] = ss.user_id
-    df_submit["Email"] = ss.email
-    df_submit["Country"] = ss.country
-    df_submit["Company"] = ss.company
-
-    # Ensure header row exists
-    if len(sheet.get_all_values()) == 0:
-        sheet.append_row(
-            [
-                "Timestamp",
-                "User ID",
-                "Email",
-                "Country",
-                "Company",
-                "Product Group",
-                "Product Name",
-                "Product Code",
-                "Description",
-                *MONTH_LIST,
-                "Total",
-            ]
-        )
+def append_rows_with_backoff(sheet, rows, tries=5):
+    """Append rows, retrying 429 quota errors with exponential backoff."""
+    import random
+    import time
 
-    for _, row in df_submit.iterrows():
-        sheet.append_row(
-            [
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                row["User ID"],
-                row["Email"],
-                row["Country"],
-                row["Company"],
-                row["group"],
-                row["name"],
-                row["code"],
-                row["detail"],
-                *[int(row[m]) for m in MONTH_LIST],
-                int(row["total"]),
-            ]
-        )
+    import gspread
+
+    for attempt in range(tries):
+        try:
+            return sheet.append_rows(
+                rows, value_input_option="RAW", insert_data_option="INSERT_ROWS"
+            )
+        except gspread.exceptions.APIError as exc:
+            # Only quota exhaustion is retryable; anything else is a real error
+            if exc.response.status_code != 429 or attempt == tries - 1:
+                raise
+            time.sleep(2**attempt + random.random())
+
+
+def submit_to_google():
+    sheet = get_sheet()
+
+    ensure_header()
+
+    # Build rows straight from the session entries (plain dicts already),
+    # then send everything in one API call
+    submitted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    uid, email, country, company = ss.user_id, ss.email, ss.country, ss.company
+    rows = [
+        [
+            submitted_at,
+            uid,
+            email,
+            country,
+            company,
+            e["group"],
+            e["name"],
+            e["code"],
+            e["detail"],
+            *[int(e[m]) for m in MONTH_LIST],
+            int(e["total"]),
+        ]
+        for e in ss.product_entries
+    ]
+    append_rows_with_backoff(sheet, rows)
 
 
 # ---------------------------------------------------
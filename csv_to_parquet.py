@@ -0,0 +1,16 @@
+"""One-off build step: convert the product CSV to Parquet for faster cold loads.
+
+Run after updating "product list.csv":
+
+    python csv_to_parquet.py
+
+The app prefers "product_list.parquet" when it exists and falls back to
+the CSV otherwise.
+"""
+import pandas as pd
+
+df = pd.read_csv("product list.csv").dropna(subset=["Product Group"])
+df.to_parquet(
+    "product_list.parquet", engine="pyarrow", compression="snappy", index=False
+)
+print(f"Wrote product_list.parquet ({len(df)} rows)")